@@ -17,6 +17,7 @@ import os
 
 from google.cloud.sql.connector import Connector, IPTypes
 import pymysql
+from pymysql.constants import CLIENT
 
 import sqlalchemy
 
@@ -50,6 +51,9 @@ def connect_with_connector() -> sqlalchemy.engine.base.Engine:
             user=db_user,
             password=db_pass,
             db=db_name,
+            # Report matched rather than changed rows, so an UPDATE that
+            # leaves a row's values unchanged still has rowcount 1
+            client_flag=CLIENT.FOUND_ROWS,
         )
         return conn
 
@@ -58,19 +62,22 @@ def connect_with_connector() -> sqlalchemy.engine.base.Engine:
         creator=getconn,
         # [START_EXCLUDE]
         # Pool size is the maximum number of permanent connections to keep.
-        pool_size=5,
+        pool_size=int(os.environ.get("DB_POOL_SIZE", 20)),
         # Temporarily exceeds the set pool_size if no connections are available.
-        max_overflow=2,
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 30)),
         # The total number of concurrent connections for your application will be
         # a total of pool_size and max_overflow.
         # 'pool_timeout' is the maximum number of seconds to wait when retrieving a
         # new connection from the pool. After the specified amount of time, an
         # exception will be thrown.
-        pool_timeout=30,  # 30 seconds
+        pool_timeout=int(os.environ.get("DB_POOL_TIMEOUT", 10)),  # 10 seconds
         # 'pool_recycle' is the maximum number of seconds a connection can persist.
         # Connections that live longer than the specified amount of time will be
         # re-established
         pool_recycle=1800,  # 30 minutes
+        # 'pool_pre_ping' tests each connection on checkout so stale connections
+        # dropped by Cloud SQL are replaced before a request uses them.
+        pool_pre_ping=True,
         # [END_EXCLUDE]
     )
     return pool
@@ -8,9 +8,12 @@ from __future__ import annotations
 import logging
 import os
 
-from flask import Flask, request, url_for
+from flask import Flask, Response, request, url_for
+from flask.json.provider import DefaultJSONProvider
+import orjson
+from pymysql.constants import ER
 import sqlalchemy
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
 
 from connect_connector import connect_with_connector
 
@@ -32,10 +35,163 @@ REQUIRED_REVIEW_FIELDS = {
 # Fields including Non-Requirementals
 REVIEW_FIELDS = REQUIRED_REVIEW_FIELDS.union({"review_text"})
 
+# Fields stored in INT columns; converted before any write so responses echo stored values
+INT_BUSINESS_FIELDS = ("owner_id",)
+INT_REVIEW_FIELDS = ("user_id", "business_id", "stars")
+
+# Largest request body accepted; these records are small, larger bodies get a 413
+MAX_REQUEST_BYTES = 16 * 1024
+
 ERROR_BUSINESS_NOT_FOUND = {'Error': 'No business with this business_id exists'}
 ERROR_REVIEW_NOT_FOUND = {'Error': 'No review with this review_id exists'}
+ERROR_MISSING_ATTRIBUTES = {'Error': 'The request body is missing at least one of the required attributes'}
+
+# Constant error bodies, encoded once
+_BODY_BUSINESS_NOT_FOUND = orjson.dumps(ERROR_BUSINESS_NOT_FOUND)
+_BODY_REVIEW_NOT_FOUND = orjson.dumps(ERROR_REVIEW_NOT_FOUND)
+_BODY_MISSING_ATTRIBUTES = orjson.dumps(ERROR_MISSING_ATTRIBUTES)
+
+# ER_CHECK_CONSTRAINT_VIOLATED (MySQL 8.0.16+) is not in pymysql.constants.ER
+ER_CHECK_CONSTRAINT_VIOLATED = 3819
+
+# SQL statements, built once at import and reused by every request
+SQL_INSERT_BUSINESS = sqlalchemy.text(
+    '''
+    INSERT INTO businesses (owner_id, name, street_address, city, state, zip_code)
+    VALUES (:owner_id, :name, :street_address, :city, :state, :zip_code)
+    '''
+)
+SQL_SELECT_BUSINESS_BY_ID = sqlalchemy.text(
+    '''
+    SELECT business_id, owner_id, name, street_address, city, state,
+           CAST(zip_code AS UNSIGNED) AS zip_code
+    FROM businesses WHERE business_id = :id
+    '''
+)
+# Page queries: `has_next` on the last row is a primary-key probe for a later
+# business, so no extra wide row is fetched just to detect the next page
+SQL_LIST_BUSINESSES = sqlalchemy.text(
+    '''
+    SELECT business_id, owner_id, name, street_address, city, state,
+           CAST(zip_code AS UNSIGNED) AS zip_code,
+           EXISTS(SELECT 1 FROM businesses nxt
+                  WHERE nxt.business_id > businesses.business_id) AS has_next
+    FROM businesses
+    WHERE business_id > :cursor
+    ORDER BY business_id
+    LIMIT :limit
+    '''
+)
+# Deprecated: OFFSET pagination scans and discards every skipped row
+SQL_LIST_BUSINESSES_BY_OFFSET = sqlalchemy.text(
+    '''
+    SELECT business_id, owner_id, name, street_address, city, state,
+           CAST(zip_code AS UNSIGNED) AS zip_code,
+           EXISTS(SELECT 1 FROM businesses nxt
+                  WHERE nxt.business_id > businesses.business_id) AS has_next
+    FROM businesses
+    ORDER BY business_id
+    LIMIT :limit OFFSET :offset
+    '''
+)
+# The JSON array for the list-by-owner/user endpoints is assembled by MySQL.
+# JSON_ARRAYAGG as a window over an ordered full frame keeps id order (the plain
+# aggregate's element order is undefined); every row carries the same array.
+SQL_LIST_BUSINESSES_FOR_OWNER = sqlalchemy.text(
+    '''
+    SELECT JSON_ARRAYAGG(JSON_OBJECT(
+               'id', business_id,
+               'owner_id', owner_id,
+               'name', name,
+               'street_address', street_address,
+               'city', city,
+               'state', state,
+               'zip_code', CAST(zip_code AS UNSIGNED),
+               'self', CONCAT(:business_base, business_id)
+           )) OVER (ORDER BY business_id
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    FROM businesses
+    WHERE owner_id = :owner_id
+    LIMIT 1
+    '''
+)
+SQL_UPDATE_BUSINESS = sqlalchemy.text(
+    '''
+    UPDATE businesses
+    SET owner_id=:owner_id, name=:name, street_address=:street_address,
+        city=:city, state=:state, zip_code=:zip_code
+    WHERE business_id=:id
+    '''
+)
+SQL_DELETE_BUSINESS = sqlalchemy.text(
+    'DELETE FROM businesses WHERE business_id = :id'
+)
+
+SQL_INSERT_REVIEW = sqlalchemy.text(
+    '''
+    INSERT INTO reviews (user_id, business_id, stars, review_text)
+    VALUES (:user_id, :business_id, :stars, :review_text)
+    '''
+)
+SQL_SELECT_REVIEW_BY_ID = sqlalchemy.text(
+    '''
+    SELECT review_id, user_id, business_id, stars, review_text
+    FROM reviews WHERE review_id = :id
+    '''
+)
+SQL_SELECT_REVIEW_FOR_UPDATE = sqlalchemy.text(
+    'SELECT user_id, business_id, review_text FROM reviews WHERE review_id = :id'
+)
+SQL_LIST_REVIEWS_FOR_USER = sqlalchemy.text(
+    '''
+    SELECT JSON_ARRAYAGG(JSON_OBJECT(
+               'id', review_id,
+               'user_id', user_id,
+               'business', CONCAT(:business_base, business_id),
+               'stars', stars,
+               'review_text', COALESCE(review_text, ''),
+               'self', CONCAT(:review_base, review_id)
+           )) OVER (ORDER BY review_id
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    FROM reviews
+    WHERE user_id = :uid
+    LIMIT 1
+    '''
+)
+SQL_UPDATE_REVIEW = sqlalchemy.text(
+    '''
+    UPDATE reviews
+    SET stars = :stars, review_text = :review_text
+    WHERE review_id = :id
+    '''
+)
+SQL_UPDATE_REVIEW_STARS = sqlalchemy.text(
+    'UPDATE reviews SET stars = :stars WHERE review_id = :id'
+)
+SQL_DELETE_REVIEW = sqlalchemy.text(
+    'DELETE FROM reviews WHERE review_id = :id'
+)
+SQL_DELETE_REVIEWS_FOR_BUSINESS = sqlalchemy.text(
+    'DELETE FROM reviews WHERE business_id = :id'
+)
+
+# JSON provider backed by orjson; responses are encoded straight to bytes
+class OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+app.json = OrjsonProvider(app)
 logger = logging.getLogger(__name__)
 
 # ==========================
@@ -66,6 +222,7 @@ def create_tables(db: sqlalchemy.engine.base.Engine) -> None:
       - FK reviews.business_id -> businesses.business_id ON DELETE CASCADE
       - UNIQUE (user_id, business_id) on reviews
       - CHECK stars between 1 and 5
+    Indexes back the list-by-owner, list-by-user and cascade-delete lookups.
     """
     with db.connect() as conn:
         # businesses
@@ -78,7 +235,8 @@ def create_tables(db: sqlalchemy.engine.base.Engine) -> None:
               street_address  VARCHAR(100) NOT NULL,
               city            VARCHAR(50) NOT NULL,
               state           CHAR(2) NOT NULL,
-              zip_code        CHAR(5) NOT NULL
+              zip_code        CHAR(5) NOT NULL,
+              KEY idx_businesses_owner (owner_id)
             ) ENGINE=InnoDB;
             '''
         ))
@@ -97,12 +255,56 @@ def create_tables(db: sqlalchemy.engine.base.Engine) -> None:
                 REFERENCES businesses(business_id)
                 ON DELETE CASCADE,
             CONSTRAINT uq_user_business UNIQUE (user_id, business_id),
-            CONSTRAINT ck_stars CHECK (stars BETWEEN 0 AND 5)
+            CONSTRAINT ck_stars CHECK (stars BETWEEN 0 AND 5),
+            KEY idx_reviews_user (user_id),
+            KEY idx_reviews_business (business_id)
             ) ENGINE=InnoDB;
             '''
         ))
+
+        # Add indexes to tables created before they were part of the DDL
+        ensure_index(conn, 'businesses', 'idx_businesses_owner', 'owner_id')
+        ensure_index(conn, 'reviews', 'idx_reviews_user', 'user_id')
+        ensure_index(conn, 'reviews', 'idx_reviews_business', 'business_id')
         conn.commit()
 
+def ensure_index(conn, table: str, index: str, columns: str) -> None:
+    exists = conn.execute(sqlalchemy.text(
+        '''
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :index
+        LIMIT 1
+        '''
+    ), {"table": table, "index": index}).first()
+    if exists is None:
+        try:
+            conn.execute(sqlalchemy.text(f'ALTER TABLE {table} ADD INDEX {index} ({columns})'))
+        except DBAPIError as e:
+            # Another worker booting at the same time added it after our lookup
+            if db_errno(e) != ER.DUP_KEYNAME:
+                raise
+
+# Indexes created last by create_tables; all present means the schema is current
+SCHEMA_INDEXES = ('idx_businesses_owner', 'idx_reviews_user', 'idx_reviews_business')
+
+def ensure_schema(db: sqlalchemy.engine.base.Engine) -> None:
+    """
+    Run create_tables only if the schema is not already in place
+    (a single information_schema lookup). Called once per worker at import.
+    """
+    with db.connect() as conn:
+        found = conn.execute(sqlalchemy.text(
+            '''
+            SELECT COUNT(DISTINCT index_name) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND index_name IN :indexes
+            '''
+        ).bindparams(sqlalchemy.bindparam('indexes', expanding=True)),
+            {"indexes": list(SCHEMA_INDEXES)}).scalar()
+
+    if found != len(SCHEMA_INDEXES):
+        create_tables(db)
+    logger.info('Schema ensured (pid %s)', os.getpid())
+
 # ==========================
 # ==== Helper functions ====
 # ==========================
@@ -110,13 +312,76 @@ def create_tables(db: sqlalchemy.engine.base.Engine) -> None:
 def bad_request(message: str, status: int = 400):
     return {'Error': message}, status
 
-def has_required_fields(data: dict, required_fields: set[str]):
-    for field in required_fields:
-        if field not in data:
-            return field
+# MySQL error code behind a DBAPI error, or None if the driver gave none
+def db_errno(e: DBAPIError) -> int | None:
+    if e.orig is None or not e.orig.args:
+        return None
+    return e.orig.args[0]
+
+# PyMySQL raises CHECK violations (e.g. stars outside 0–5) as OperationalError,
+# not IntegrityError, so callers test the error code
+def is_check_violation(e: DBAPIError) -> bool:
+    return db_errno(e) == ER_CHECK_CONSTRAINT_VIOLATED
+
+# zip_code is stored as CHAR(5); accept an int or digit string of up to 5 digits
+def valid_zip_code(value) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return 0 <= value <= 99999
+    if isinstance(value, str):
+        return 0 < len(value) <= 5 and value.isascii() and value.isdigit()
+    return False
+
+# An int, or a string of decimal digits; None for anything else (floats included,
+# since MySQL would round them into an INT column)
+def parse_int(value) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        digits = value[1:] if value.startswith('-') else value
+        if digits and digits.isascii() and digits.isdigit():
+            return int(value)
     return None
 
-def row_to_business_dict(row) -> dict:
+# Copy of data with the given fields (where present) converted to int,
+# or None if any of them is not an integer
+def with_int_fields(data: dict, fields: tuple[str, ...]) -> dict | None:
+    out = dict(data)
+    for field in fields:
+        if field in out:
+            value = parse_int(out[field])
+            if value is None:
+                return None
+            out[field] = value
+    return out
+
+# A fresh Response per call (Flask may add headers to it) around a pre-encoded body
+def encoded_response(body: bytes, status: int) -> Response:
+    return Response(body, status=status, mimetype='application/json')
+
+def business_not_found() -> Response:
+    return encoded_response(_BODY_BUSINESS_NOT_FOUND, 404)
+
+def review_not_found() -> Response:
+    return encoded_response(_BODY_REVIEW_NOT_FOUND, 404)
+
+def missing_attributes() -> Response:
+    return encoded_response(_BODY_MISSING_ATTRIBUTES, 400)
+
+# Returns the required fields absent from data (empty set if none are missing)
+def missing_fields(data: dict, required_fields: set[str]) -> set[str]:
+    if not isinstance(data, dict):
+        return required_fields
+    return required_fields - data.keys()
+
+# External URL prefix for this request, computed once rather than per row via url_for
+def external_base() -> str:
+    return 'https://' + request.host + request.script_root
+
+def row_to_business_dict(row, base: str) -> dict:
     d = row._asdict()
     out = {
         "id": d["business_id"],
@@ -125,25 +390,63 @@ def row_to_business_dict(row) -> dict:
         "street_address": d["street_address"],
         "city": d["city"],
         "state": d["state"],
-        "zip_code": int(d["zip_code"]),
-        "self": url_for('get_business_by_id', business_id=d["business_id"], _external=True, _scheme='https')
+        "zip_code": d["zip_code"],
+        "self": f"{base}/{BUSINESSES}/{d['business_id']}"
     }
     return out
 
-def row_to_review_dict(row) -> dict:
+def row_to_review_dict(row, base: str) -> dict:
     d = row._asdict()
     review_id = d["review_id"]
     business_id = d["business_id"]
     out = {
         "id": review_id,
         "user_id": d["user_id"],
-        "business": url_for('get_business_by_id', business_id=business_id, _external=True, _scheme='https'),
+        "business": f"{base}/{BUSINESSES}/{business_id}",
         "stars": d["stars"],
         "review_text": d["review_text"] if d["review_text"] is not None else "",
-        "self": url_for('get_review_by_id', review_id=review_id, _external=True, _scheme='https')
+        "self": f"{base}/{REVIEWS}/{review_id}"
     }
     return out
 
+# Builds the business response from values already known to the handler,
+# without a Row or url_for (read paths starting from a Row use row_to_business_dict).
+# content must already have been through with_int_fields.
+def business_payload(business_id: int, content: dict) -> dict:
+    base = external_base()
+    return {
+        "id": business_id,
+        "owner_id": content["owner_id"],
+        "name": content["name"],
+        "street_address": content["street_address"],
+        "city": content["city"],
+        "state": content["state"],
+        "zip_code": int(content["zip_code"]),
+        "self": f"{base}/{BUSINESSES}/{business_id}"
+    }
+
+# Builds the review response from values already known to the handler
+def review_payload(review_id: int, user_id: int, business_id: int, stars: int, review_text: str | None) -> dict:
+    base = external_base()
+    return {
+        "id": review_id,
+        "user_id": user_id,
+        "business": f"{base}/{BUSINESSES}/{business_id}",
+        "stars": stars,
+        "review_text": review_text if review_text is not None else "",
+        "self": f"{base}/{REVIEWS}/{review_id}"
+    }
+
+# Runs a query whose single column is a JSON array built by MySQL, returned as-is
+def json_array_response(stmt, params: dict) -> Response:
+    with db.connect() as conn:
+        entries = conn.execute(stmt, params).scalar()
+    if entries is None:
+        return encoded_response(b'[]', 200)
+    if isinstance(entries, str):
+        entries = entries.encode()
+    return encoded_response(entries, 200)
+
 # ==============================
 
 @app.route('/')
@@ -157,21 +460,19 @@ def index():
 # Post Business
 @app.route('/' + BUSINESSES, methods=['POST'])
 def post_business():
-    content = request.get_json()
-    missing = has_required_fields(content, REQUIRED_BUSINESS_FIELDS)
-    if missing:
-        return bad_request("The request body is missing at least one of the required attributes")
+    content = request.get_json(silent=True, cache=False) or {}
+    if not content or missing_fields(content, REQUIRED_BUSINESS_FIELDS):
+        return missing_attributes()
+    if not valid_zip_code(content["zip_code"]):
+        return bad_request("The zip_code must be at most 5 digits")
+    content = with_int_fields(content, INT_BUSINESS_FIELDS)
+    if content is None:
+        return bad_request("Invalid business data")
 
     try:
         with db.connect() as conn:
-            # Prepare and execute INSERT
-            stmt = sqlalchemy.text(
-                '''
-                INSERT INTO businesses (owner_id, name, street_address, city, state, zip_code)
-                VALUES (:owner_id, :name, :street_address, :city, :state, :zip_code)
-                '''
-            )
-            conn.execute(stmt, parameters={
+            # Execute INSERT
+            result = conn.execute(SQL_INSERT_BUSINESS, parameters={
                 "owner_id": content["owner_id"],
                 "name": content["name"],
                 "street_address": content["street_address"],
@@ -180,111 +481,96 @@ def post_business():
                 "zip_code": content["zip_code"],
             })
 
-            # Get new id and commit
-            new_id = conn.execute(sqlalchemy.text('SELECT LAST_INSERT_ID()')).scalar()
+            # New id comes back with the INSERT, no follow-up query needed
+            new_id = result.lastrowid
             conn.commit()
 
-            # Fetch the created row, add self URL
-            row = conn.execute(sqlalchemy.text(
-                '''
-                SELECT business_id, owner_id, name, street_address, city, state, zip_code
-                FROM businesses WHERE business_id = :id
-                '''
-            ), {"id": new_id}).one()
-
     except Exception as e:
         logger.exception(e)
         return {"Error": "Unable to create business"}, 500
 
-    return row_to_business_dict(row), 201
+    return business_payload(new_id, content), 201
 
 # Get All Businesses (paginated by 3)
+# Pages are keyed on the last business_id seen (`cursor`); `offset` is still
+# honoured for existing clients but is deprecated.
 @app.route('/' + BUSINESSES, methods=['GET'])
 def get_businesses():
-    # If params are absent, return the first page
     limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor', type=int)
     offset = request.args.get('offset', type=int)
-    if limit is None or offset is None:
-        limit, offset = 3, 0
 
-    # Fetch one extra row to know if a "next" page exists
-    fetch_limit = max(0, limit) + 1
-    offset = max(0, offset)
+    # If params are absent, return the first page
+    if limit is None or (cursor is None and offset is None):
+        limit, cursor, offset = 3, 0, None
+
+    limit = max(0, limit)
+
+    if offset is not None and cursor is None:
+        offset = max(0, offset)
+        stmt = SQL_LIST_BUSINESSES_BY_OFFSET
+        params = {"limit": limit, "offset": offset}
+    else:
+        offset = None
+        stmt = SQL_LIST_BUSINESSES
+        params = {"limit": limit, "cursor": max(0, cursor)}
 
+    # Page is small; read it and release the connection before responding
     with db.connect() as conn:
-        rows = list(conn.execute(sqlalchemy.text(
-            '''
-            SELECT business_id, owner_id, name, street_address, city, state, zip_code
-            FROM businesses
-            ORDER BY business_id
-            LIMIT :limit OFFSET :offset
-            '''
-        ), {"limit": fetch_limit, "offset": offset}))
+        rows = list(conn.execute(stmt, params))
 
     # Build current page entries
-    entries = [row_to_business_dict(r) for r in rows[:limit]]
-    body = {"entries": entries}
-
-    # Add `next` only if there are more than `limit` rows
-    if len(rows) > limit:
-        body["next"] = url_for('get_businesses',
-                               offset=offset + limit,
-                               limit=limit,
-                               _external=True, _scheme='https')
+    base = external_base()
+    body = {"entries": [row_to_business_dict(r, base) for r in rows]}
+
+    # Add `next` only if a business exists past the last row on this page
+    if rows and rows[-1].has_next:
+        if offset is not None:
+            body["next"] = url_for('get_businesses',
+                                   offset=offset + limit,
+                                   limit=limit,
+                                   _external=True, _scheme='https')
+        else:
+            body["next"] = url_for('get_businesses',
+                                   cursor=rows[-1].business_id,
+                                   limit=limit,
+                                   _external=True, _scheme='https')
     return body, 200
 
 # Get Business by ID
 @app.route('/' + BUSINESSES + '/<int:business_id>', methods=['GET'])
 def get_business_by_id(business_id):
     with db.connect() as conn:
-        row = conn.execute(sqlalchemy.text(
-            '''
-            SELECT business_id, owner_id, name, street_address, city, state, zip_code
-            FROM businesses WHERE business_id = :id
-            '''
-        ), {"id": business_id}).one_or_none()
-        if row is None:
-            return ERROR_BUSINESS_NOT_FOUND, 404
-        return row_to_business_dict(row), 200
+        row = conn.execute(SQL_SELECT_BUSINESS_BY_ID, {"id": business_id}).one_or_none()
+
+    if row is None:
+        return business_not_found()
+    return row_to_business_dict(row, external_base()), 200
 
 # Get All Businesses by Owner ID
 @app.route('/owners/<int:owner_id>/businesses', methods=['GET'])
 def list_businesses_for_owner(owner_id):
-    with db.connect() as conn:
-        rows = conn.execute(sqlalchemy.text(
-            '''
-            SELECT business_id, owner_id, name, street_address, city, state, zip_code
-            FROM businesses
-            WHERE owner_id = :owner_id
-            ORDER BY business_id
-            '''
-        ), {"owner_id": owner_id})
-        return [row_to_business_dict(r) for r in rows], 200
+    base = external_base()
+    return json_array_response(SQL_LIST_BUSINESSES_FOR_OWNER, {
+        "owner_id": owner_id,
+        "business_base": f"{base}/{BUSINESSES}/",
+    })
 
 # Edit Business by ID
 @app.route('/' + BUSINESSES + '/<int:business_id>', methods=['PUT'])
 def edit_business(business_id):
-    content = request.get_json()
-    missing = has_required_fields(content, REQUIRED_BUSINESS_FIELDS)
-    if missing:
-        return bad_request("The request body is missing at least one of the required attributes")
-
-    with db.connect() as conn:
-        # Ensure business exists
-        existing = conn.execute(sqlalchemy.text(
-            'SELECT business_id FROM businesses WHERE business_id = :id'
-        ), {"id": business_id}).one_or_none()
-        if existing is None:
-            return ERROR_BUSINESS_NOT_FOUND, 404
-
-        conn.execute(sqlalchemy.text(
-            '''
-            UPDATE businesses
-            SET owner_id=:owner_id, name=:name, street_address=:street_address,
-                city=:city, state=:state, zip_code=:zip_code
-            WHERE business_id=:id
-            '''
-        ), {
+    content = request.get_json(silent=True, cache=False) or {}
+    if not content or missing_fields(content, REQUIRED_BUSINESS_FIELDS):
+        return missing_attributes()
+    if not valid_zip_code(content["zip_code"]):
+        return bad_request("The zip_code must be at most 5 digits")
+    content = with_int_fields(content, INT_BUSINESS_FIELDS)
+    if content is None:
+        return bad_request("Invalid business data")
+
+    with db.begin() as conn:
+        # No matched row means no such business
+        result = conn.execute(SQL_UPDATE_BUSINESS, {
             "owner_id": content["owner_id"],
             "name": content["name"],
             "street_address": content["street_address"],
@@ -293,28 +579,24 @@ def edit_business(business_id):
             "zip_code": content["zip_code"],
             "id": business_id
         })
-        conn.commit()
 
-        row = conn.execute(sqlalchemy.text(
-            '''
-            SELECT business_id, owner_id, name, street_address, city, state, zip_code
-            FROM businesses WHERE business_id = :id
-            '''
-        ), {"id": business_id}).one()
-        return row_to_business_dict(row), 200
+    if result.rowcount == 0:
+        return business_not_found()
+
+    return business_payload(business_id, content), 200
 
 # Delete Business (and its Reviews)
 @app.route('/' + BUSINESSES + '/<int:business_id>', methods=['DELETE'])
 def delete_business(business_id):
-    with db.connect() as conn:
-        # Deleting the business will cascade delete its reviews (FK ON DELETE CASCADE)
-        result = conn.execute(sqlalchemy.text(
-            'DELETE FROM businesses WHERE business_id = :id'
-        ), {"id": business_id})
-        conn.commit()
-        if result.rowcount == 0:
-            return ERROR_BUSINESS_NOT_FOUND, 404
-        return '', 204
+    with db.begin() as conn:
+        # Remove its reviews with one range delete on idx_reviews_business first;
+        # FK ON DELETE CASCADE remains as a safety net
+        conn.execute(SQL_DELETE_REVIEWS_FOR_BUSINESS, {"id": business_id})
+        result = conn.execute(SQL_DELETE_BUSINESS, {"id": business_id})
+
+    if result.rowcount == 0:
+        return business_not_found()
+    return '', 204
 
 # ===========================
 # ==== Reviews Endpoints ====
@@ -323,53 +605,38 @@ def delete_business(business_id):
 # Post Review (enforce one per user per business)
 @app.route('/' + REVIEWS, methods=['POST'])
 def post_reviews():
-    content = request.get_json()
+    content = request.get_json(silent=True, cache=False) or {}
 
     # Required fields
-    missing = has_required_fields(content, REQUIRED_REVIEW_FIELDS)
-    if missing:
-        return bad_request("The request body is missing at least one of the required attributes")
+    if not content or missing_fields(content, REQUIRED_REVIEW_FIELDS):
+        return missing_attributes()
+    content = with_int_fields(content, INT_REVIEW_FIELDS)
+    if content is None:
+        return bad_request("Invalid review data")
 
     try:
         with db.connect() as conn:
-            # Validate the business exists (404 if not)
-            b = conn.execute(
-                sqlalchemy.text('SELECT business_id FROM businesses WHERE business_id = :bid'),
-                {"bid": content["business_id"]}
-            ).one_or_none()
-            if b is None:
-                return ERROR_BUSINESS_NOT_FOUND, 404
-
-            # Insert review
-            stmt = sqlalchemy.text(
-                '''
-                INSERT INTO reviews (user_id, business_id, stars, review_text)
-                VALUES (:user_id, :business_id, :stars, :review_text)
-                '''
-            )
-            conn.execute(stmt, {
+            # Insert review (FK on business_id rejects unknown businesses)
+            result = conn.execute(SQL_INSERT_REVIEW, {
                 "user_id": content["user_id"],
                 "business_id": content["business_id"],
                 "stars": content["stars"],
                 "review_text": content.get("review_text", "")
             })
 
-            # Fetch new id and commit
-            new_id = conn.execute(sqlalchemy.text('SELECT LAST_INSERT_ID()')).scalar()
+            # New id comes back with the INSERT, no follow-up query needed
+            new_id = result.lastrowid
             conn.commit()
 
-            # Fetch the created row, add self URL
-            row = conn.execute(sqlalchemy.text(
-                '''
-                SELECT review_id, user_id, business_id, stars, review_text
-                FROM reviews WHERE review_id = :id
-                '''
-            ), {"id": new_id}).one()
-
     except IntegrityError as e:
+        errno = db_errno(e)
+
+        # No business with this business_id - 404 Error
+        if errno == ER.NO_REFERENCED_ROW_2:
+            return business_not_found()
+
         # Unique (user_id, business_id) - 409 Error
-        msg = str(e.orig).lower()
-        if 'uq_user_business' in msg or 'duplicate' in msg or 'unique' in msg:
+        if errno == ER.DUP_ENTRY:
             return bad_request(
                 "You have already submitted a review for this business. "
                 "You can update your previous review, or delete it and submit a new review",
@@ -377,101 +644,97 @@ def post_reviews():
             )
         # Other integrity issues (CHECK stars 0–5, etc) - 400 Error
         return bad_request("Invalid review data")
-    
+
+    except DataError:
+        # Value MySQL cannot store in the column (e.g. errno 1366) - 400 Error
+        return bad_request("Invalid review data")
+
+    except DBAPIError as e:
+        # CHECK stars 0–5 - 400 Error
+        if is_check_violation(e):
+            return bad_request("Invalid review data")
+        logger.exception(e)
+        return {"Error": "Unable to create review"}, 500
+
     except Exception as e:
         logger.exception(e)
         return {"Error": "Unable to create review"}, 500
 
-    return row_to_review_dict(row), 201
+    return review_payload(new_id, content["user_id"], content["business_id"],
+                          content["stars"], content.get("review_text", "")), 201
 
 # Get Review by ID
 @app.route('/' + REVIEWS + '/<int:review_id>', methods=['GET'])
 def get_review_by_id(review_id):
     with db.connect() as conn:
-        row = conn.execute(sqlalchemy.text(
-            '''
-            SELECT review_id, user_id, business_id, stars, review_text
-            FROM reviews WHERE review_id = :id
-            '''
-        ), {"id": review_id}).one_or_none()
-        if row is None:
-            return ERROR_REVIEW_NOT_FOUND, 404
-        return row_to_review_dict(row), 200
+        row = conn.execute(SQL_SELECT_REVIEW_BY_ID, {"id": review_id}).one_or_none()
+
+    if row is None:
+        return review_not_found()
+    return row_to_review_dict(row, external_base()), 200
 
 # List all Reviews by a User ID
 @app.route('/users/<int:user_id>/reviews', methods=['GET'])
 def list_reviews_for_user(user_id):
-    with db.connect() as conn:
-        rows = conn.execute(sqlalchemy.text(
-            '''
-            SELECT review_id, user_id, business_id, stars, review_text
-            FROM reviews WHERE user_id = :uid
-            ORDER BY review_id
-            '''
-        ), {"uid": user_id})
-        return [row_to_review_dict(r) for r in rows], 200
+    base = external_base()
+    return json_array_response(SQL_LIST_REVIEWS_FOR_USER, {
+        "uid": user_id,
+        "business_base": f"{base}/{BUSINESSES}/",
+        "review_base": f"{base}/{REVIEWS}/",
+    })
 
 # Edit a Review by ID (stars required; review_text optional)
 @app.route('/' + REVIEWS + '/<int:review_id>', methods=['PUT'])
 def edit_review(review_id):
-    content = request.get_json(silent=True) or {}
-    if "stars" not in content:
-        return bad_request("The request body is missing at least one of the required attributes")
+    content = request.get_json(silent=True, cache=False) or {}
+    if not isinstance(content, dict) or "stars" not in content:
+        return missing_attributes()
+    content = with_int_fields(content, INT_REVIEW_FIELDS)
+    if content is None:
+        return bad_request("Invalid review data")
 
-    with db.connect() as conn:
-        exists = conn.execute(sqlalchemy.text(
-            'SELECT review_id FROM reviews WHERE review_id = :id'
-        ), {"id": review_id}).one_or_none()
-        if exists is None:
-            return ERROR_REVIEW_NOT_FOUND, 404
-
-        # Allow optional review_text
-        if "review_text" in content:
-            stmt = sqlalchemy.text(
-                '''
-                UPDATE reviews
-                SET stars = :stars, review_text = :review_text
-                WHERE review_id = :id
-                '''
-            )
-            params = {"stars": content["stars"], "review_text": content["review_text"], "id": review_id}
-        else:
-            stmt = sqlalchemy.text(
-                'UPDATE reviews SET stars = :stars WHERE review_id = :id'
-            )
-            params = {"stars": content["stars"], "id": review_id}
+    # Allow optional review_text
+    if "review_text" in content:
+        stmt = SQL_UPDATE_REVIEW
+        params = {"stars": content["stars"], "review_text": content["review_text"], "id": review_id}
+    else:
+        stmt = SQL_UPDATE_REVIEW_STARS
+        params = {"stars": content["stars"], "id": review_id}
 
-        try:
-            conn.execute(stmt, params)
-            conn.commit()
-        except IntegrityError:
+    try:
+        with db.begin() as conn:
+            # No matched row means no such review
+            if conn.execute(stmt, params).rowcount == 0:
+                return review_not_found()
+
+            # Read back the columns the update doesn't touch
+            existing = conn.execute(SQL_SELECT_REVIEW_FOR_UPDATE, {"id": review_id}).one()
+    except IntegrityError:
+        return bad_request("Invalid review data")
+    except DBAPIError as e:
+        # CHECK stars 0–5 - 400 Error
+        if is_check_violation(e):
             return bad_request("Invalid review data")
+        raise
 
-        row = conn.execute(sqlalchemy.text(
-            '''
-            SELECT review_id, user_id, business_id, stars, review_text
-            FROM reviews WHERE review_id = :id
-            '''
-        ), {"id": review_id}).one()
-        return row_to_review_dict(row), 200
+    return review_payload(review_id, existing.user_id, existing.business_id,
+                          content["stars"], existing.review_text), 200
 
 # Delete a Review by ID
 @app.route('/' + REVIEWS + '/<int:review_id>', methods=['DELETE'])
 def delete_review(review_id):
-    with db.connect() as conn:
-        result = conn.execute(sqlalchemy.text(
-            'DELETE FROM reviews WHERE review_id = :id'
-        ), {"id": review_id})
-        conn.commit()
-        if result.rowcount == 0:
-            return ERROR_REVIEW_NOT_FOUND, 404
-        return '', 204
+    with db.begin() as conn:
+        result = conn.execute(SQL_DELETE_REVIEW, {"id": review_id})
+
+    if result.rowcount == 0:
+        return review_not_found()
+    return '', 204
 
 # ================
 # ==== Main ======
 # ================
 
-
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
 init_db()
-create_tables(db)
+ensure_schema(db)
 